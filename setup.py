@@ -0,0 +1,22 @@
+"""
+    Builds PyHTML with optional compiled renderer.
+
+    `python setup.py build_ext --inplace` to compile it in place.
+"""
+
+from setuptools import setup
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    ext_modules = []
+else:
+    ext_modules = cythonize("src/pyhtml/_cyrender.pyx", language_level=3)
+
+setup(
+    name="pyhtml",
+    package_dir={"": "src"},
+    packages=["pyhtml"],
+    install_requires=["fastapi", "uvicorn"],
+    ext_modules=ext_modules,
+)
@@ -2,26 +2,146 @@
     Create HTML inside Python and serve it.
 """
 
-from typing import TypeAlias, Any
-from functools import lru_cache
+from typing import Callable, TypeAlias, Any
+from functools import cache, lru_cache
+import tempfile
+import gzip
+import sys
+import os
 
-from fastapi.responses import HTMLResponse
-from fastapi import FastAPI
+from fastapi.responses import Response
+from fastapi.staticfiles import StaticFiles
+from fastapi import FastAPI, Request
 
 PROPERTIES: TypeAlias = dict[str, Any]
+# Properties of the component normalized into pairs of interned key and rendered value.
+_PROPERTIES_ITEMS: TypeAlias = tuple[tuple[str, str], ...]
 
+# Fixed parts of the HTML page around title, styles and body.
+_HTML_HEAD_PREFIX = b"\n<html>\n    <head>\n        <title>"
+_HTML_TITLE_TO_STYLE = b"</title>\n        <style>"
+_HTML_HEAD_TO_BODY = b"</style>\n    </head>\n    <body>\n        "
+_HTML_SUFFIX = b"\n    </body>\n</html>\n        "
 
-def _render_properties(properties: PROPERTIES) -> str:
+# Page is always served as UTF-8 encoded bytes, so media type is given explicitly.
+_HTML_MEDIA_TYPE = "text/html; charset=utf-8"
+
+
+@cache
+def _get_uvicorn():
+    """
+    Imports Uvicorn lazily as it is only required for serving.
+    """
+    import uvicorn
+
+    return uvicorn
+
+
+def _normalize_properties(properties: PROPERTIES | None) -> _PROPERTIES_ITEMS:
+    """
+    Converts properties into tuple of pairs, so equal properties can share cache.
+
+    Values are rendered into strings here, so cache key never holds values
+    that compare equal but render differently (e.g. `1` and `True`).
+    """
+    if not properties:
+        return ()
+    return tuple(
+        (sys.intern(key), f'"{value}"' if isinstance(value, str) else str(value))
+        for key, value in properties.items()
+    )
+
+
+def _py_render_properties(properties: _PROPERTIES_ITEMS) -> str:
     """
     Renders properties into HTML properties string.
     """
     rendered_properties = []
+    for key, value in properties:
+        if rendered_properties:
+            rendered_properties.append(" ")
+        rendered_properties.extend((key, "=", value))
+    return "".join(rendered_properties)
+
+
+def _render_style(selector: str, properties: PROPERTIES) -> bytes:
+    """
+    Renders style for the selector into CSS encoded as UTF-8.
+    """
+    rendered_style = [selector, "{"]
     for key, value in properties.items():
-        if isinstance(value, str):
-            value = f'"{value}"'
+        rendered_style.extend((key, ":", str(value), ";"))
+    rendered_style.append("}")
+    return "".join(rendered_style).encode("utf-8")
+
+
+# Opening prefix and closing tag for common tags, so they are not built on each render.
+# Used only by pure Python `_py_render_tag`, compiled renderer builds tags itself.
+_TAG_OPEN_CLOSE: dict[str, tuple[str, str]] = {
+    tag: (sys.intern(f"<{tag}"), sys.intern(f"</{tag}>"))
+    for tag in (
+        "a",
+        "b",
+        "button",
+        "div",
+        "form",
+        "h1",
+        "h2",
+        "h3",
+        "hr",
+        "i",
+        "img",
+        "input",
+        "label",
+        "li",
+        "ol",
+        "p",
+        "span",
+        "table",
+        "td",
+        "th",
+        "tr",
+        "ul",
+    )
+}
+
+
+def _py_render_tag(tag: str | None, properties: str, body: str) -> str:
+    """
+    Renders tag with already rendered properties around already rendered body.
+    """
+    open_prefix, close_tag = _TAG_OPEN_CLOSE.get(tag) or (f"<{tag}", f"</{tag}>")
+    if properties:
+        return "".join((open_prefix, " ", properties, ">", body, close_tag))
+    return "".join((open_prefix, ">", body, close_tag))
 
-        rendered_properties.append(f"{key}={value}")
-    return " ".join(rendered_properties)
+
+# Pure Python renderer keeps its own name, so it can be compared with compiled one.
+_render_properties = _py_render_properties
+_render_tag = _py_render_tag
+
+try:
+    # Compiled renderer is optional, see `setup.py`.
+    from ._cyrender import render_properties as _render_properties
+    from ._cyrender import render_tag as _render_tag
+except ImportError:
+    pass
+
+# Components usually share same properties (e.g. classes), so cache hits are frequent.
+_render_properties = lru_cache(maxsize=1024)(_render_properties)
+
+
+# Bumped when any component is changed, so apps drop pages rendered before that.
+# Components do not know their app (or parent), so change is tracked globally.
+_components_mutations = 0
+
+
+def _mark_components_mutated() -> None:
+    """
+    Notifies apps that some component was changed after creation.
+    """
+    global _components_mutations
+    _components_mutations += 1
 
 
 class UIComponent:
@@ -35,30 +155,133 @@ class UIComponent:
         tag: str | None = None,
         properties: PROPERTIES | None = None,
     ) -> None:
-        self.data = data
-        self.properties = properties
-        self.tag = tag
+        self._set_data(data)
+        self._properties = properties
+        self._properties_items = _normalize_properties(properties)
+        self._tag = tag
+        self._specialize_render()
+
+    @property
+    def data(self) -> Any | None:
+        """
+        Nested components are stored as tuple, so they stay validated.
+        """
+        return self._data
+
+    @data.setter
+    def data(self, value: Any | None) -> None:
+        self._set_data(value)
+        self._specialize_render()
+        _mark_components_mutated()
+
+    @property
+    def properties(self) -> PROPERTIES | None:
+        return self._properties
+
+    @properties.setter
+    def properties(self, value: PROPERTIES | None) -> None:
+        self._properties = value
+        self._properties_items = _normalize_properties(value)
+        self._specialize_render()
+        _mark_components_mutated()
+
+    @property
+    def tag(self) -> str | None:
+        return self._tag
+
+    @tag.setter
+    def tag(self, value: str | None) -> None:
+        self._tag = value
+        self._specialize_render()
+        _mark_components_mutated()
+
+    def _set_data(self, data: Any | None) -> None:
+        """
+        Stores data, validating and freezing nested components.
+        """
+        self._is_container = isinstance(data, (list, tuple))
+        self._data = _freeze_nested_components(data) if self._is_container else data
+
+    def _specialize_render(self) -> None:
+        """
+        Picks render path once fields are set, so render does not check data type.
+        """
+        self._rendered: str | None = None
+        if (
+            not self._is_container
+            and not self._properties_items
+            and (self._data is None or isinstance(self._data, str))
+        ):
+            # Plain tag without properties is rendered right away.
+            body = "" if self._data is None else self._data
+            self._rendered = _render_tag(self._tag, "", body)
 
     def render(self) -> str:
         """
         Renders component into HTML tag.
+
+        Components with plain data are memoized, nested ones are re-rendered,
+        so changes to children are picked up.
         """
-        rendered_body = (
-            [self.data]
-            if not isinstance(self.data, list) and self.data is not None
-            else []
-        )
+        if self._rendered is not None:
+            return self._rendered
+
+        properties = _render_properties(self._properties_items)
+        if self._is_container:
+            body = "".join([component.render() for component in self._data])
+            return _render_tag(self._tag, properties, body)
 
-        if isinstance(self.data, list):
-            for component in self.data:
-                if not isinstance(component, UIComponent):
-                    raise ValueError(
-                        f"Expected UIComponent nested data to contain list of UIComponents but got {type(component)}"
-                    )
-                rendered_body.append(component.render())
+        body = "" if self._data is None else str(self._data)
+        self._rendered = _render_tag(self._tag, properties, body)
+        return self._rendered
 
-        properties = _render_properties(self.properties) if self.properties else ""
-        return f"<{self.tag} {properties}>{''.join(rendered_body)}</{self.tag}>"
+
+def _freeze_nested_components(
+    components: list[Any] | tuple[Any, ...],
+) -> tuple[UIComponent, ...]:
+    """
+    Returns nested components as tuple, so they cannot be changed after validation.
+
+    Raises if nested data contains anything other than UIComponent.
+    """
+    components = tuple(components)
+    for component in components:
+        if not isinstance(component, UIComponent):
+            raise ValueError(
+                f"Expected UIComponent nested data to contain list of UIComponents but got {type(component)}"
+            )
+    return components
+
+
+def _accepts_gzip(accept_encoding: str) -> bool:
+    """
+    Returns True if Accept-Encoding header allows gzip (respecting `q=0` and `*`).
+    """
+    gzip_quality = None
+    any_quality = None
+    for coding in accept_encoding.split(","):
+        name, *params = coding.split(";")
+        name = name.strip().lower()
+        if name not in ("gzip", "*"):
+            continue
+
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+
+        if name == "gzip":
+            gzip_quality = quality
+        else:
+            any_quality = quality
+
+    if gzip_quality is None:
+        gzip_quality = any_quality or 0.0
+    return gzip_quality > 0
 
 
 class _BaseUIApp:
@@ -67,53 +290,121 @@ class _BaseUIApp:
     """
 
     def __init__(self) -> None:
-        self._pregenerated_styles: dict[str, PROPERTIES] = {}
-        self._components: list[UIComponent] = []
+        # Styles are rendered into CSS once they are added, see `_render_style`.
+        self._style_chunks: dict[str, bytes] = {}
+
+        # Bound render of each component, so page render uses their own memoization.
+        self._component_renders: list[Callable[[], str]] = []
+
+        # Versions are bumped on every mutation, head and response are keyed by them.
+        self._components_version = 0
+        self._styles_version = 0
+
+        # Rendered body is cached until component is added or changed.
+        self._cached_body_key: tuple[int, int] | None = None
+        self._cached_body_bytes = b""
+
+        # HTML head is pre-encoded and refreshed only when styles or title changes.
+        self._html_template_key: tuple[int, str] | None = None
+        self._prefix_bytes = b""
+
+        # Response is reused between requests until any version is bumped.
+        self._response_key: tuple[tuple[int, int], int, str] | None = None
+        self._response: Response | None = None
+        self._gzip_response: Response | None = None
 
         self._default_title = "Built with PyHTML!"
 
-    @lru_cache(maxsize=1)
-    def _render_components(self) -> str:
+    def _components_key(self) -> tuple[int, int]:
         """
-        Renders all components into HTML.
+        Returns key that changes when component is added or any component is changed.
+        """
+        return (self._components_version, _components_mutations)
+
+    def _render_components(self) -> bytes:
         """
-        return ["".join([component.render() for component in self._components])]
+        Renders all components into HTML encoded as UTF-8.
 
-    @lru_cache(maxsize=1)
-    def _render_pregenerated_styles(self) -> str:
+        Accumulates into buffer, so large pages do not keep list of rendered components.
+        """
+        body_key = self._components_key()
+        if self._cached_body_key != body_key:
+            rendered = bytearray()
+            extend = rendered.extend
+            for render in self._component_renders:
+                extend(render().encode("utf-8"))
+            self._cached_body_bytes = bytes(rendered)
+            self._cached_body_key = body_key
+        return self._cached_body_bytes
+
+    def _render_pregenerated_styles(self) -> bytes:
         """
         Returns styles rendered in CSS.
         """
-        rendered_styles = []
-        for selector, properties in self._pregenerated_styles.items():
-            style_body = []
-            for key, value in properties.items():
-                style_body.append(f"{key}: {value}")
-            rendered_styles.append(f"{selector}" + "{" + ",\n".join(style_body) + "}")
+        return b"\n".join(self._style_chunks.values())
 
-        return "\n".join(rendered_styles)
+    def _refresh_html_template(self) -> None:
+        """
+        Rebuilds HTML prefix (head with styles) if styles or title was changed.
+        """
+        template_key = (self._styles_version, self._default_title)
+        if self._html_template_key == template_key:
+            return
+
+        self._prefix_bytes = b"".join(
+            (
+                _HTML_HEAD_PREFIX,
+                self._default_title.encode("utf-8"),
+                _HTML_TITLE_TO_STYLE,
+                self._render_pregenerated_styles(),
+                _HTML_HEAD_TO_BODY,
+            )
+        )
+        self._html_template_key = template_key
 
-    def _generate_html_content(self) -> str:
+    def _generate_html_content(self) -> bytes:
         """
         Generates HTML response content with all styles and body.
         """
-        return f"""
-<html>
-    <head>
-        <title>{self._default_title}</title>
-        <style>{self._render_pregenerated_styles()}</style>
-    </head>
-    <body>
-        { self._render_components()}
-    </body>
-</html>
+        self._refresh_html_template()
+        return b"".join((self._prefix_bytes, self._render_components(), _HTML_SUFFIX))
+
+    def _get_response(self, accepts_gzip: bool = False) -> Response:
         """
+        Returns cached response, rebuilding it if components or styles was changed.
 
-    def _route_handler(self) -> HTMLResponse:
+        Gzip compressed variant is built together with plain one, not per request.
+        """
+        response_key = (
+            self._components_key(),
+            self._styles_version,
+            self._default_title,
+        )
+        if self._response is None or self._response_key != response_key:
+            html_content = self._generate_html_content()
+            self._response = Response(
+                content=html_content,
+                status_code=200,
+                headers={"vary": "accept-encoding"},
+                media_type=_HTML_MEDIA_TYPE,
+            )
+            self._gzip_response = Response(
+                content=gzip.compress(html_content, compresslevel=6),
+                status_code=200,
+                headers={"content-encoding": "gzip", "vary": "accept-encoding"},
+                media_type=_HTML_MEDIA_TYPE,
+            )
+            self._response_key = response_key
+        return self._gzip_response if accepts_gzip else self._response
+
+    async def _route_handler(self, request: Request) -> Response:
         """
         Route handler for the FastAPI app.
+
+        Async, so FastAPI does not dispatch it through the threadpool.
         """
-        return HTMLResponse(self._generate_html_content(), status_code=200)
+        accepts_gzip = _accepts_gzip(request.headers.get("accept-encoding", ""))
+        return self._get_response(accepts_gzip)
 
 
 class _UIAppTagsShortcutMixin:
@@ -128,8 +419,12 @@ class _UIAppTagsShortcutMixin:
         properties: PROPERTIES | None = None,
         **kwargs,
     ):
-        properties = (kwargs | properties) if properties is not None else kwargs
-        self.add_component(UIComponent(data=data, tag="span", properties=properties))
+        if not properties:
+            properties = kwargs
+        elif kwargs:
+            kwargs.update(properties)
+            properties = kwargs
+        self.add_component(UIComponent(data=data, tag=tag, properties=properties))
 
     def span(
         self, data: Any | None = None, properties: PROPERTIES | None = None, **kwargs
@@ -152,13 +447,18 @@ class UIApp(_BaseUIApp, _UIAppTagsShortcutMixin):
         """
         Adds raw component to list of all components.
         """
-        self._components.append(component)
+        if not isinstance(component, UIComponent):
+            raise ValueError(f"Expected UIComponent but got {type(component)}")
+
+        self._component_renders.append(component.render)
+        self._components_version += 1
 
     def style(self, selector: str, properties: PROPERTIES) -> None:
         """
         Adds style for the given selector by overwriting it.
         """
-        self._pregenerated_styles[selector] = properties
+        self._style_chunks[selector] = _render_style(selector, properties)
+        self._styles_version += 1
 
     def run(self) -> None:
         """
@@ -166,18 +466,31 @@ class UIApp(_BaseUIApp, _UIAppTagsShortcutMixin):
 
         You can also try to use `build` to create static files and serve by your own.
         """
-        import uvicorn
-
         app = FastAPI()
         app.add_api_route("/", self._route_handler)
         # TODO: Add multi routes.
 
-        uvicorn.run(app)
-        del uvicorn
+        _get_uvicorn().run(app)
+
+    def run_static(self, directory: str | None = None) -> None:
+        """
+        Builds static files once and serves them with FastAPI static files.
+
+        Page is not rendered per request, so changes made after start are not served.
+        Builds into temporary directory if no directory is given.
+        """
+        if directory is None:
+            directory = tempfile.mkdtemp(prefix="pyhtml-")
+        self.build(directory)
+
+        app = FastAPI()
+        app.mount("/", StaticFiles(directory=directory, html=True))
+
+        _get_uvicorn().run(app)
 
     def build(self, directory: str = "./") -> None:
         """
         Creates packed static files that can served with static server.
         """
-        with open(f"{directory}index.html", mode="w") as f:
+        with open(os.path.join(directory, "index.html"), mode="wb") as f:
             f.write(self._generate_html_content())
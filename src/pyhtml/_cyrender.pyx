@@ -0,0 +1,32 @@
+# cython: language_level=3
+"""
+    Compiled counterpart of the pure Python tag rendering in `pyhtml`.
+"""
+
+
+def render_properties(tuple properties) -> str:
+    """
+    Renders properties into HTML properties string.
+    """
+    cdef list rendered_properties = []
+    for key, value in properties:
+        if rendered_properties:
+            rendered_properties.append(" ")
+        rendered_properties.extend((key, "=", value))
+    return "".join(rendered_properties)
+
+
+def render_tag(tag, str properties, str body) -> str:
+    """
+    Renders tag with already rendered properties around already rendered body.
+
+    Tag is formatted like in the pure Python version, so `None` renders as `<None>`.
+    Does not use `_TAG_OPEN_CLOSE` table, concatenation here is already cheap.
+    """
+    cdef str name = tag if type(tag) is str else f"{tag}"
+    cdef list parts
+    if properties:
+        parts = ["<", name, " ", properties, ">", body, "</", name, ">"]
+    else:
+        parts = ["<", name, ">", body, "</", name, ">"]
+    return "".join(parts)
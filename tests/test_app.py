@@ -0,0 +1,95 @@
+"""
+    Checks rendering and serving of the UIApp.
+"""
+
+import pytest
+
+import pyhtml
+from pyhtml import UIApp
+
+
+def _render_body(ui: UIApp) -> str:
+    return ui._render_components().decode("utf-8")
+
+
+def test_tag_shortcuts_render_own_tag():
+    ui = UIApp()
+    ui.span("span text", style="color: red")
+    ui.div("div text")
+    ui.button("click me", onClick="alert(1)")
+    assert _render_body(ui) == (
+        '<span style="color: red">span text</span>'
+        "<div>div text</div>"
+        '<button onClick="alert(1)">click me</button>'
+    )
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("", False),
+        ("gzip", True),
+        ("gzip, deflate, br", True),
+        ("GZIP;Q=0.5", True),
+        ("gzip;q=0", False),
+        ("deflate", False),
+        ("*", True),
+        ("*;q=0", False),
+        ("*, gzip;q=0", False),
+    ],
+)
+def test_accepts_gzip(accept_encoding, expected):
+    assert pyhtml._accepts_gzip(accept_encoding) is expected
+
+
+def test_styles_render_valid_css():
+    ui = UIApp()
+    ui.style(".mystyle", {"color": "green", "margin": 0})
+    ui.style("span", {"color": "red"})
+    assert ui._render_pregenerated_styles() == (
+        b".mystyle{color:green;margin:0;}\nspan{color:red;}"
+    )
+
+
+@pytest.mark.parametrize("trailing_separator", [False, True])
+def test_build_writes_index_into_directory(tmp_path, trailing_separator):
+    ui = UIApp()
+    ui.span("text")
+    directory = str(tmp_path / "public")
+    (tmp_path / "public").mkdir()
+    ui.build(directory + "/" if trailing_separator else directory)
+
+    assert [path.name for path in tmp_path.iterdir()] == ["public"]
+    assert b"<span>text</span>" in (tmp_path / "public" / "index.html").read_bytes()
+
+
+def test_add_component_invalidates_cached_page():
+    ui = UIApp()
+    ui.span("first")
+    assert _render_body(ui) == "<span>first</span>"
+
+    ui.span("second")
+    assert _render_body(ui) == "<span>first</span><span>second</span>"
+    assert b"<span>second</span>" in ui._get_response().body
+
+
+def test_component_change_invalidates_cached_page():
+    ui = UIApp()
+    component = pyhtml.UIComponent(data="a", tag="p")
+    child = pyhtml.UIComponent(data="child", tag="b")
+    ui.add_component(component)
+    ui.div([child])
+    assert b"<p>a</p><div><b>child</b></div>" in ui._get_response().body
+
+    component.data = "b"
+    child.tag = "i"
+    ui.style("p", {"color": "red"})
+    body = ui._get_response().body
+    assert b"p{color:red;}" in body
+    assert b"<p>b</p><div><i>child</i></div>" in body
+
+
+def test_add_component_rejects_non_component():
+    ui = UIApp()
+    with pytest.raises(ValueError):
+        ui.add_component("<span>raw</span>")
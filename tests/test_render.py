@@ -0,0 +1,121 @@
+"""
+    Checks rendering of components, with pure Python and compiled renderers.
+"""
+
+import pytest
+
+import pyhtml
+from pyhtml import UIComponent
+
+try:
+    from pyhtml import _cyrender
+except ImportError:
+    _cyrender = None
+
+requires_cyrender = pytest.mark.skipif(
+    _cyrender is None, reason="Compiled renderer is not built"
+)
+
+
+@pytest.mark.parametrize(
+    "component, expected",
+    [
+        (UIComponent(data="text", tag="span"), "<span>text</span>"),
+        (UIComponent(data=None, tag="hr"), "<hr></hr>"),
+        (UIComponent(data=1, tag="custom-tag"), "<custom-tag>1</custom-tag>"),
+        (
+            UIComponent(data="text", tag="span", properties={"class": "mystyle"}),
+            '<span class="mystyle">text</span>',
+        ),
+        (
+            UIComponent(data=[UIComponent(data="el", tag="span")], tag="div"),
+            "<div><span>el</span></div>",
+        ),
+    ],
+)
+def test_component_render(component, expected):
+    assert component.render() == expected
+
+
+def test_properties_values_render_distinct():
+    components = [
+        UIComponent(data="a", tag="span", properties={"tabindex": 1}),
+        UIComponent(data="b", tag="span", properties={"tabindex": True}),
+        UIComponent(data="c", tag="span", properties={"data-items": [1, 2]}),
+    ]
+    assert [component.render() for component in components] == [
+        "<span tabindex=1>a</span>",
+        "<span tabindex=True>b</span>",
+        "<span data-items=[1, 2]>c</span>",
+    ]
+
+
+def test_properties_round_trip():
+    component = UIComponent(data="text", tag="span", properties={"class": "x"})
+    assert component.properties == {"class": "x"}
+
+    component.properties = component.properties
+    assert component.render() == '<span class="x">text</span>'
+
+
+def test_nested_data_rejects_non_components():
+    with pytest.raises(ValueError):
+        UIComponent(data=[UIComponent(data="el", tag="span"), "raw"], tag="div")
+
+
+def test_nested_data_is_not_affected_by_caller_list():
+    children = [UIComponent(data="el", tag="span")]
+    component = UIComponent(data=children, tag="div")
+    children.append("raw")
+
+    assert component.render() == "<div><span>el</span></div>"
+    component.data = component.data
+    assert component.render() == "<div><span>el</span></div>"
+
+
+@pytest.mark.parametrize(
+    "tag, properties, body, expected",
+    [
+        ("span", "", "text", "<span>text</span>"),
+        ("div", 'class="mystyle"', "", '<div class="mystyle"></div>'),
+        ("custom-tag", "", "", "<custom-tag></custom-tag>"),
+        (None, "", "text", "<None>text</None>"),
+    ],
+)
+def test_py_render_tag(tag, properties, body, expected):
+    assert pyhtml._py_render_tag(tag, properties, body) == expected
+
+
+@requires_cyrender
+@pytest.mark.parametrize(
+    "tag, properties, body",
+    [
+        ("span", "", "text"),
+        ("div", 'class="mystyle"', "<span>nested</span>"),
+        ("custom-tag", "", ""),
+        (None, "", "text"),
+        (None, "tabindex=1", ""),
+    ],
+)
+def test_render_tag_matches_python(tag, properties, body):
+    assert _cyrender.render_tag(tag, properties, body) == pyhtml._py_render_tag(
+        tag, properties, body
+    )
+
+
+@requires_cyrender
+@pytest.mark.parametrize(
+    "properties",
+    [
+        {},
+        {"class": "mystyle"},
+        {"style": "color: red", "tabindex": 1},
+        {"tabindex": True},
+        {"data-items": [1, 2]},
+    ],
+)
+def test_render_properties_matches_python(properties):
+    normalized = pyhtml._normalize_properties(properties)
+    assert _cyrender.render_properties(normalized) == pyhtml._py_render_properties(
+        normalized
+    )